@@ -1,11 +1,29 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import unicodedata
+import os
+import uuid
 from pathlib import Path
 import io
 
+# XLSX 읽기 엔진 (calamine이 없으면 openpyxl 사용)
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
+# 환경 데이터 parquet 캐시 (pyarrow가 없으면 CSV만 사용)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_CACHE = True
+except ImportError:
+    PARQUET_CACHE = False
+
 # 페이지 설정
 st.set_page_config(
     page_title="극지식물 EC 농도 연구",
@@ -23,6 +41,9 @@ html, body, [class*="css"] {
 </style>
 """, unsafe_allow_html=True)
 
+# Plotly 한글 폰트
+PLOT_FONT = dict(family="Malgun Gothic, Apple SD Gothic Neo, sans-serif", size=12)
+
 # 학교별 설정
 SCHOOL_CONFIG = {
     "송도고": {"ec": 1.0, "color": "#FF6B6B", "samples": 29},
@@ -31,10 +52,69 @@ SCHOOL_CONFIG = {
     "동산고": {"ec": 8.0, "color": "#FFE66D", "samples": 58}
 }
 
+# 학교 순서/색상 (재실행마다 다시 만들지 않도록 모듈에서 한 번만 계산)
+SCHOOLS = tuple(SCHOOL_CONFIG)
+SCHOOL_COLORS = tuple(config["color"] for config in SCHOOL_CONFIG.values())
+OPTIMAL_IDX = SCHOOLS.index("하늘고")  # 최적 EC 조건 학교
+
+# 분석에 사용하는 컬럼
+ENV_COLUMNS = ["temperature", "humidity", "ph", "ec"]
+GROWTH_COLUMNS = ["생중량(g)", "잎 수(장)", "지상부 길이(mm)", "지하부길이(mm)"]
+
+# 센서/측정 정밀도가 낮아 float32로 충분
+ENV_DTYPES = dict.fromkeys(ENV_COLUMNS, "float32")
+GROWTH_DTYPES = dict.fromkeys(GROWTH_COLUMNS, "float32")
+
+# 이 개수를 넘는 시계열 등 대용량 trace는 SVG 대신 WebGL(scattergl)로 그림
+WEBGL_THRESHOLD = 1000
+
 def normalize_filename(name):
     """파일명 정규화 (NFC/NFD 모두 처리)"""
     return unicodedata.normalize("NFC", name)
 
+@st.cache_data
+def index_data_dir(data_path):
+    """data 폴더 파일 색인 (정규화된 파일명 -> 경로)"""
+    return {normalize_filename(f.name): f for f in data_path.iterdir()}
+
+def read_env_csv(file_path):
+    """환경 데이터 CSV 읽기 (원본 파일과 일치하는 parquet 캐시가 있으면 사용)"""
+    cache_path = file_path.parent / ".cache" / f"{file_path.stem}.parquet"
+    
+    # 원본 CSV의 수정 시각/크기가 정확히 같을 때만 캐시 사용
+    source_stat = file_path.stat()
+    source_key = f"{source_stat.st_mtime_ns}:{source_stat.st_size}".encode()
+    
+    if PARQUET_CACHE and cache_path.exists():
+        try:
+            metadata = pq.read_schema(cache_path).metadata or {}
+            if metadata.get(b"source_key") == source_key:
+                return pd.read_parquet(cache_path).astype(ENV_DTYPES)
+        except Exception:
+            pass  # 손상된 캐시는 무시하고 CSV로 다시 생성
+    
+    df = pd.read_csv(file_path, encoding='utf-8-sig', usecols=ENV_COLUMNS, dtype=ENV_DTYPES)
+    
+    if PARQUET_CACHE:
+        tmp_path = None
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata(
+                {**(table.schema.metadata or {}), b"source_key": source_key}
+            )
+            # 임시 파일에 쓴 뒤 교체 (중단되어도 잘린 캐시가 남지 않도록)
+            # 파일 권한은 umask를 따르도록 mkstemp(0600) 대신 일반 생성 사용
+            tmp_path = cache_path.with_name(f"{cache_path.name}.{uuid.uuid4().hex}.tmp")
+            pq.write_table(table, tmp_path, compression="zstd")
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            # 캐시 저장 실패 시 CSV 결과만 사용
+            if tmp_path and tmp_path.exists():
+                tmp_path.unlink()
+    
+    return df
+
 @st.cache_data
 def load_env_data():
     """환경 데이터 로딩 (CSV 4개)"""
@@ -46,16 +126,13 @@ def load_env_data():
         return env_data
     
     # 모든 CSV 파일 탐색
-    for file_path in data_path.iterdir():
+    for filename, file_path in index_data_dir(data_path).items():
         if file_path.suffix.lower() == '.csv':
-            filename = normalize_filename(file_path.name)
-            
             # 학교명 추출
-            for school in SCHOOL_CONFIG.keys():
-                school_normalized = normalize_filename(school)
-                if school_normalized in filename:
+            for school in SCHOOLS:
+                if school in filename:
                     try:
-                        df = pd.read_csv(file_path, encoding='utf-8-sig')
+                        df = read_env_csv(file_path)
                         env_data[school] = df
                         break
                     except Exception as e:
@@ -73,7 +150,7 @@ def load_growth_data():
         return growth_data
     
     # XLSX 파일 찾기
-    xlsx_files = list(data_path.glob("*.xlsx"))
+    xlsx_files = [f for f in index_data_dir(data_path).values() if f.suffix.lower() == '.xlsx']
     
     if not xlsx_files:
         st.error("❌ 생육결과 XLSX 파일을 찾을 수 없습니다.")
@@ -82,51 +159,88 @@ def load_growth_data():
     xlsx_path = xlsx_files[0]
     
     try:
-        # 모든 시트 읽기
-        excel_file = pd.ExcelFile(xlsx_path)
-        
+        try:
+            excel_file = pd.ExcelFile(xlsx_path, engine=EXCEL_ENGINE)
+        except ValueError:
+            if EXCEL_ENGINE == "openpyxl":
+                raise
+            # pandas 2.2 미만은 calamine 엔진을 모르므로 openpyxl로 다시 시도
+            excel_file = pd.ExcelFile(xlsx_path, engine="openpyxl")
+        
+        # 학교명 매칭 (시트명 -> 학교)
+        sheet_schools = {}
         for sheet_name in excel_file.sheet_names:
             sheet_normalized = normalize_filename(sheet_name)
-            
-            # 학교명 매칭
-            for school in SCHOOL_CONFIG.keys():
-                school_normalized = normalize_filename(school)
-                if school_normalized in sheet_normalized:
-                    df = pd.read_excel(xlsx_path, sheet_name=sheet_name)
-                    growth_data[school] = df
+            for school in SCHOOLS:
+                if school in sheet_normalized:
+                    sheet_schools[sheet_name] = school
                     break
         
+        # 매칭된 시트를 한 번에 읽기
+        if sheet_schools:
+            sheets = pd.read_excel(excel_file, sheet_name=list(sheet_schools),
+                                   usecols=GROWTH_COLUMNS, dtype=GROWTH_DTYPES)
+            for sheet_name, df in sheets.items():
+                growth_data[sheet_schools[sheet_name]] = df
+        
     except Exception as e:
         st.error(f"❌ XLSX 파일 로딩 실패: {e}")
     
     return growth_data
 
-def calculate_school_stats(env_data, growth_data, school):
-    """학교별 통계 계산"""
-    stats = {}
-    
-    # 환경 데이터 통계
-    if school in env_data:
-        env_df = env_data[school]
-        stats['temp_avg'] = env_df['temperature'].mean()
-        stats['humidity_avg'] = env_df['humidity'].mean()
-        stats['ph_avg'] = env_df['ph'].mean()
-        stats['ec_avg'] = env_df['ec'].mean()
-    
-    # 생육 데이터 통계
-    if school in growth_data:
-        growth_df = growth_data[school]
-        stats['weight_avg'] = growth_df['생중량(g)'].mean()
-        stats['leaf_avg'] = growth_df['잎 수(장)'].mean()
-        stats['above_avg'] = growth_df['지상부 길이(mm)'].mean()
-        stats['below_avg'] = growth_df['지하부길이(mm)'].mean()
-        stats['sample_count'] = len(growth_df)
-    
-    return stats
+@st.cache_data
+def combine_school_data(data_by_school):
+    """학교별 데이터 통합 (학교 컬럼은 category 타입)"""
+    return pd.concat(
+        [
+            df.assign(학교=pd.Categorical([school] * len(df), categories=SCHOOLS))
+            for school, df in data_by_school.items()
+        ],
+        ignore_index=True
+    )
+
+@st.cache_data
+def calculate_env_stats(env_data):
+    """학교별 환경 데이터 통계 계산 (학교명 -> 통계)"""
+    env_avg = combine_school_data(env_data).groupby('학교', observed=True)[ENV_COLUMNS].mean()
+    
+    env_stats = {}
+    for school in SCHOOLS:
+        stats = {}
+        if school in env_avg.index:
+            env_row = env_avg.loc[school]
+            stats['temp_avg'] = env_row['temperature']
+            stats['humidity_avg'] = env_row['humidity']
+            stats['ph_avg'] = env_row['ph']
+            stats['ec_avg'] = env_row['ec']
+        env_stats[school] = stats
+    
+    return env_stats
+
+@st.cache_data
+def calculate_growth_stats(growth_data):
+    """학교별 생육 데이터 통계 계산 (학교명 -> 통계)"""
+    growth_groups = combine_school_data(growth_data).groupby('학교', observed=True)
+    growth_avg = growth_groups[GROWTH_COLUMNS].mean()
+    growth_avg['sample_count'] = growth_groups.size()
+    
+    growth_stats = {}
+    for school in SCHOOLS:
+        stats = {}
+        if school in growth_avg.index:
+            growth_row = growth_avg.loc[school]
+            stats['weight_avg'] = growth_row['생중량(g)']
+            stats['leaf_avg'] = growth_row['잎 수(장)']
+            stats['above_avg'] = growth_row['지상부 길이(mm)']
+            stats['below_avg'] = growth_row['지하부길이(mm)']
+            stats['sample_count'] = int(growth_row['sample_count'])
+        growth_stats[school] = stats
+    
+    return growth_stats
 
 def analyze_correlation(x_values, y_values, x_name, y_name):
     """상관관계 분석 및 해석"""
-    correlation = pd.Series(x_values).corr(pd.Series(y_values))
+    correlation = float(np.corrcoef(x_values, y_values)[0, 1])
     
     # 상관계수 해석
     if abs(correlation) >= 0.7:
@@ -139,8 +253,9 @@ def analyze_correlation(x_values, y_values, x_name, y_name):
     direction = "양의" if correlation > 0 else "음의"
     
     # 최적값 찾기
-    max_idx = y_values.index(max(y_values))
-    min_idx = y_values.index(min(y_values))
+    y_array = np.asarray(y_values)
+    max_idx = int(y_array.argmax())
+    min_idx = int(y_array.argmin())
     
     return {
         'correlation': correlation,
@@ -150,22 +265,36 @@ def analyze_correlation(x_values, y_values, x_name, y_name):
         'min_idx': min_idx
     }
 
+@st.cache_data
+def summary_to_xlsx_bytes(summary_df):
+    """결과 요약 XLSX 직렬화 (재실행 시 캐시된 bytes 재사용)"""
+    buffer = io.BytesIO()
+    summary_df.to_excel(buffer, index=False, engine="openpyxl")
+    return buffer.getvalue()
+
+def make_scatter(x, y, **kwargs):
+    """산점도 trace 생성 (점이 많으면 WebGL 렌더링 사용)"""
+    if len(x) > WEBGL_THRESHOLD:
+        return go.Scattergl(x=x, y=y, **kwargs)
+    return go.Scatter(x=x, y=y, **kwargs)
+
 # 메인 앱
 def main():
     st.title("🌱 pH와 EC에 따른 나도수영 생중량 분석")
     
-    # 데이터 로딩
+    # 환경 데이터 로딩 (생육 데이터는 탭1을 그린 뒤 로딩)
     with st.spinner("📊 데이터 로딩 중..."):
         env_data = load_env_data()
-        growth_data = load_growth_data()
     
-    if not env_data or not growth_data:
+    if not env_data:
         st.error("❌ 데이터를 불러올 수 없습니다. data 폴더와 파일을 확인해주세요.")
         return
     
+    env_stats = calculate_env_stats(env_data)
+    
     # 사이드바
     st.sidebar.header("🔍 학교 선택")
-    school_options = ["전체"] + list(SCHOOL_CONFIG.keys())
+    school_options = ["전체", *SCHOOLS]
     selected_school = st.sidebar.selectbox("학교를 선택하세요", school_options)
     
     # 탭 생성
@@ -182,27 +311,20 @@ def main():
         
         # 학교별 EC 조건 표
         st.subheader("📋 학교별 EC 조건")
-        config_df = pd.DataFrame([
-            {
-                "학교명": school,
-                "EC 목표": f"{config['ec']} dS/m",
-                "개체수": f"{config['samples']}개",
-                "대표색상": config['color']
-            }
-            for school, config in SCHOOL_CONFIG.items()
-        ])
+        config_df = pd.DataFrame({
+            "학교명": SCHOOLS,
+            "EC 목표": [f"{config['ec']} dS/m" for config in SCHOOL_CONFIG.values()],
+            "개체수": [f"{config['samples']}개" for config in SCHOOL_CONFIG.values()],
+            "대표색상": SCHOOL_COLORS
+        })
         st.dataframe(config_df, use_container_width=True, hide_index=True)
         
         # 주요 지표 카드
         st.subheader("📊 주요 지표")
         
         total_samples = sum(config['samples'] for config in SCHOOL_CONFIG.values())
-        all_temps = [stats['temp_avg'] for school in SCHOOL_CONFIG.keys() 
-                     if (stats := calculate_school_stats(env_data, growth_data, school)) 
-                     and 'temp_avg' in stats]
-        all_humidity = [stats['humidity_avg'] for school in SCHOOL_CONFIG.keys() 
-                        if (stats := calculate_school_stats(env_data, growth_data, school)) 
-                        and 'humidity_avg' in stats]
+        all_temps = [stats['temp_avg'] for stats in env_stats.values() if 'temp_avg' in stats]
+        all_humidity = [stats['humidity_avg'] for stats in env_stats.values() if 'humidity_avg' in stats]
         
         avg_temp = sum(all_temps) / len(all_temps) if all_temps else 0
         avg_humidity = sum(all_humidity) / len(all_humidity) if all_humidity else 0
@@ -228,44 +350,41 @@ def main():
             horizontal_spacing=0.1
         )
         
-        schools = list(SCHOOL_CONFIG.keys())
         ec_values = []
         ph_values = []
         temp_values = []
         humidity_values = []
         
-        for school in schools:
-            stats = calculate_school_stats(env_data, growth_data, school)
+        for school in SCHOOLS:
+            stats = env_stats[school]
             ec_values.append(stats.get('ec_avg', 0))
             ph_values.append(stats.get('ph_avg', 0))
             temp_values.append(stats.get('temp_avg', 0))
             humidity_values.append(stats.get('humidity_avg', 0))
         
-        colors = [SCHOOL_CONFIG[s]['color'] for s in schools]
-        
         # EC
-        fig.add_trace(go.Scatter(x=schools, y=ec_values, mode='lines+markers',
-                                 line=dict(color='#FF6B6B', width=3),
-                                 marker=dict(size=10, color=colors),
-                                 name='EC'), row=1, col=1)
+        fig.add_trace(make_scatter(x=SCHOOLS, y=ec_values, mode='lines+markers',
+                                   line=dict(color='#FF6B6B', width=3),
+                                   marker=dict(size=10, color=SCHOOL_COLORS),
+                                   name='EC'), row=1, col=1)
         
         # pH
-        fig.add_trace(go.Scatter(x=schools, y=ph_values, mode='lines+markers',
-                                 line=dict(color='#4ECDC4', width=3),
-                                 marker=dict(size=10, color=colors),
-                                 name='pH'), row=1, col=2)
+        fig.add_trace(make_scatter(x=SCHOOLS, y=ph_values, mode='lines+markers',
+                                   line=dict(color='#4ECDC4', width=3),
+                                   marker=dict(size=10, color=SCHOOL_COLORS),
+                                   name='pH'), row=1, col=2)
         
         # 온도
-        fig.add_trace(go.Scatter(x=schools, y=temp_values, mode='lines+markers',
-                                 line=dict(color='#95E1D3', width=3),
-                                 marker=dict(size=10, color=colors),
-                                 name='온도'), row=2, col=1)
+        fig.add_trace(make_scatter(x=SCHOOLS, y=temp_values, mode='lines+markers',
+                                   line=dict(color='#95E1D3', width=3),
+                                   marker=dict(size=10, color=SCHOOL_COLORS),
+                                   name='온도'), row=2, col=1)
         
         # 습도
-        fig.add_trace(go.Scatter(x=schools, y=humidity_values, mode='lines+markers',
-                                 line=dict(color='#FFE66D', width=3),
-                                 marker=dict(size=10, color=colors),
-                                 name='습도'), row=2, col=2)
+        fig.add_trace(make_scatter(x=SCHOOLS, y=humidity_values, mode='lines+markers',
+                                   line=dict(color='#FFE66D', width=3),
+                                   marker=dict(size=10, color=SCHOOL_COLORS),
+                                   name='습도'), row=2, col=2)
         
         fig.update_xaxes(title_text="학교", row=2, col=1)
         fig.update_xaxes(title_text="학교", row=2, col=2)
@@ -277,7 +396,7 @@ def main():
         fig.update_layout(
             height=600,
             showlegend=False,
-            font=dict(family="Malgun Gothic, Apple SD Gothic Neo, sans-serif", size=12)
+            font=PLOT_FONT
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -286,12 +405,29 @@ def main():
     with tab2:
         st.header("🧪 pH와 생중량의 관계")
         
-        schools = list(SCHOOL_CONFIG.keys())
+        # 생육 데이터 로딩 (탭2, 탭3에서만 사용)
+        with st.spinner("📊 생육 데이터 로딩 중..."):
+            growth_data = load_growth_data()
+    
+    with tab3:
+        st.header("⚡ EC와 생중량의 관계")
+    
+    if not growth_data:
+        for tab in (tab2, tab3):
+            with tab:
+                st.error("❌ 생육 데이터를 불러올 수 없습니다. data 폴더와 파일을 확인해주세요.")
+        return
+    
+    # 환경 + 생육 통계 (탭2, 탭3)
+    growth_stats = calculate_growth_stats(growth_data)
+    full_stats = {school: {**env_stats[school], **growth_stats[school]} for school in SCHOOLS}
+    
+    with tab2:
         ph_values = []
         weight_values = []
         
-        for school in schools:
-            stats = calculate_school_stats(env_data, growth_data, school)
+        for school in SCHOOLS:
+            stats = full_stats[school]
             ph_values.append(stats.get('ph_avg', 0))
             weight_values.append(stats.get('weight_avg', 0))
         
@@ -301,8 +437,8 @@ def main():
         # 분석 결과 설명
         st.subheader("📊 상관관계 분석 결과")
         
-        optimal_school = schools[analysis['max_idx']]
-        worst_school = schools[analysis['min_idx']]
+        optimal_school = SCHOOLS[analysis['max_idx']]
+        worst_school = SCHOOLS[analysis['min_idx']]
         
         if analysis['direction'] == "양의":
             trend_explanation = f"pH가 높아질수록 생중량이 증가하는 경향을 보입니다."
@@ -320,17 +456,17 @@ def main():
         # 그래프
         fig = go.Figure()
         
-        fig.add_trace(go.Scatter(
+        fig.add_trace(make_scatter(
             x=ph_values,
             y=weight_values,
             mode='lines+markers+text',
             marker=dict(
                 size=15,
-                color=[SCHOOL_CONFIG[s]['color'] for s in schools],
+                color=SCHOOL_COLORS,
                 line=dict(width=2, color='white')
             ),
             line=dict(width=3, color='rgba(100,100,100,0.3)'),
-            text=schools,
+            text=SCHOOLS,
             textposition="top center",
             textfont=dict(size=12, color='black'),
             name='학교별 데이터'
@@ -341,7 +477,7 @@ def main():
             xaxis_title="pH 평균",
             yaxis_title="생중량 평균 (g)",
             height=500,
-            font=dict(family="Malgun Gothic, Apple SD Gothic Neo, sans-serif", size=14),
+            font={**PLOT_FONT, "size": 14},
             hovermode='closest',
             plot_bgcolor='rgba(240,240,240,0.5)'
         )
@@ -360,15 +496,12 @@ def main():
     
     # 탭3: EC와 생중량
     with tab3:
-        st.header("⚡ EC와 생중량의 관계")
-        
-        schools = list(SCHOOL_CONFIG.keys())
         ec_values = []
         weight_values = []
         ph_values = []
         
-        for school in schools:
-            stats = calculate_school_stats(env_data, growth_data, school)
+        for school in SCHOOLS:
+            stats = full_stats[school]
             ec_values.append(stats.get('ec_avg', 0))
             weight_values.append(stats.get('weight_avg', 0))
             ph_values.append(stats.get('ph_avg', 0))
@@ -379,8 +512,8 @@ def main():
         # 분석 결과 설명
         st.subheader("📊 상관관계 분석 결과")
         
-        optimal_school = schools[analysis['max_idx']]
-        worst_school = schools[analysis['min_idx']]
+        optimal_school = SCHOOLS[analysis['max_idx']]
+        worst_school = SCHOOLS[analysis['min_idx']]
         optimal_ec = ec_values[analysis['max_idx']]
         
         # EC 특성 분석
@@ -408,27 +541,26 @@ def main():
         # EC와 생중량 관계 그래프
         fig1 = go.Figure()
         
-        fig1.add_trace(go.Scatter(
+        fig1.add_trace(make_scatter(
             x=ec_values,
             y=weight_values,
             mode='lines+markers+text',
             marker=dict(
                 size=15,
-                color=[SCHOOL_CONFIG[s]['color'] for s in schools],
+                color=SCHOOL_COLORS,
                 line=dict(width=2, color='white')
             ),
             line=dict(width=3, color='rgba(100,100,100,0.3)'),
-            text=schools,
+            text=SCHOOLS,
             textposition="top center",
             textfont=dict(size=12, color='black'),
             name='학교별 데이터'
         ))
         
         # 최적 EC 강조 (하늘고)
-        optimal_idx = schools.index("하늘고")
         fig1.add_annotation(
-            x=ec_values[optimal_idx],
-            y=weight_values[optimal_idx],
+            x=ec_values[OPTIMAL_IDX],
+            y=weight_values[OPTIMAL_IDX],
             text="최적 조건",
             showarrow=True,
             arrowhead=2,
@@ -443,7 +575,7 @@ def main():
             xaxis_title="EC 평균 (dS/m)",
             yaxis_title="생중량 평균 (g)",
             height=500,
-            font=dict(family="Malgun Gothic, Apple SD Gothic Neo, sans-serif", size=14),
+            font={**PLOT_FONT, "size": 14},
             hovermode='closest',
             plot_bgcolor='rgba(240,240,240,0.5)'
         )
@@ -488,7 +620,7 @@ def main():
                 colorbar=dict(title="생중량 (g)"),
                 line=dict(width=1, color='white')
             ),
-            text=schools,
+            text=SCHOOLS,
             textposition="top center",
             textfont=dict(size=10, color='black'),
             name='학교별 데이터'
@@ -503,7 +635,7 @@ def main():
                 camera=dict(eye=dict(x=1.5, y=1.5, z=1.3))
             ),
             height=600,
-            font=dict(family="Malgun Gothic, Apple SD Gothic Neo, sans-serif", size=12)
+            font=PLOT_FONT
         )
         
         st.plotly_chart(fig2, use_container_width=True)
@@ -511,30 +643,22 @@ def main():
         # 결과 요약
         st.subheader("📈 분석 결과 요약")
         
-        summary_data = []
-        for i, school in enumerate(schools):
-            summary_data.append({
-                "학교": school,
-                "EC (dS/m)": f"{ec_values[i]:.2f}",
-                "pH": f"{ph_values[i]:.2f}",
-                "생중량 (g)": f"{weight_values[i]:.3f}",
-                "순위": ""
-            })
-        
-        summary_df = pd.DataFrame(summary_data)
+        summary_df = pd.DataFrame({
+            "학교": SCHOOLS,
+            "EC (dS/m)": [f"{v:.2f}" for v in ec_values],
+            "pH": [f"{v:.2f}" for v in ph_values],
+            "생중량 (g)": [f"{v:.3f}" for v in weight_values],
+            "순위": ""
+        })
         summary_df = summary_df.sort_values('생중량 (g)', ascending=False).reset_index(drop=True)
         summary_df['순위'] = range(1, len(summary_df) + 1)
         
         st.dataframe(summary_df, use_container_width=True, hide_index=True)
         
         # 다운로드 버튼
-        buffer = io.BytesIO()
-        summary_df.to_excel(buffer, index=False, engine="openpyxl")
-        buffer.seek(0)
-        
         st.download_button(
             label="📥 결과 다운로드 (XLSX)",
-            data=buffer,
+            data=summary_to_xlsx_bytes(summary_df),
             file_name="극지식물_EC분석_결과.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )